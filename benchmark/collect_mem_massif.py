@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import io
 import json
 import os
+import queue
 import re
-import statistics as stats
+import shutil
 import subprocess
 import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any
+
+import numpy as np
+
+from stats_utils import t_crit_95
 
 KEM_ALGS: List[str] = [
     "ML-KEM-512",
@@ -50,6 +58,13 @@ SIG_ALGS: List[str] = [
     "SPHINCS+-SHAKE-256s-simple",
 ]
 
+_PEAK_RE = re.compile(r"(\d+)\s+\(peak\)")
+_DETAILED_PREFIX = " Detailed snapshots: ["
+_INV_MB = 1.0 / (1024.0 * 1024.0)
+# Column order of the per-run sample matrix; also the JSON keys and CSV column groups.
+_METRIC_KEYS = ("insts", "maxBytes_mb", "maxHeap_mb", "extHeap_mb", "maxStack_mb")
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description=(
@@ -74,6 +89,46 @@ def parse_args() -> argparse.Namespace:
         type=str,
         help="Run only a specific algorithm (liboqs name)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=get_default_jobs(),
+        help="Number of Massif runs executed in parallel (default: number of usable CPUs)",
+    )
+    parser.add_argument(
+        "--detailed-freq",
+        type=int,
+        default=1000000,
+        help=(
+            "Massif --detailed-freq (default: 1000000). Only the peak snapshot is read, "
+            "and Massif always records it as detailed."
+        ),
+    )
+    parser.add_argument(
+        "--max-snapshots",
+        type=int,
+        default=20,
+        help="Massif --max-snapshots (default: 20)",
+    )
+    parser.add_argument(
+        "--peak-inaccuracy",
+        type=float,
+        default=1.0,
+        help=(
+            "Massif --peak-inaccuracy in percent (default: 1.0). Larger values take fewer "
+            "peak snapshots but may under-report the peak by up to that percentage."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Checkpoint every finished algorithm/operation under <results_dir>/ckpt and skip "
+            "pairs already checkpointed by an interrupted run with the same settings. "
+            "Checkpoints are removed once the sweep completes."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -83,67 +138,42 @@ def get_script_dir() -> str:
     return os.getcwd()
 
 
-def t_critical_95(df: int) -> float:
-    """Two-tailed 95% t critical value (alpha=0.05)."""
-    if df <= 1:
-        return 0.0
-
-    table = {
-        2: 4.303,
-        3: 3.182,
-        4: 2.776,
-        5: 2.571,
-        6: 2.447,
-        7: 2.365,
-        8: 2.306,
-        9: 2.262,
-        10: 2.228,
-        11: 2.201,
-        12: 2.179,
-        13: 2.160,
-        14: 2.145,
-        15: 2.131,
-        16: 2.120,
-        17: 2.110,
-        18: 2.101,
-        19: 2.093,
-        20: 2.086,
-        21: 2.080,
-        22: 2.074,
-        23: 2.069,
-        24: 2.064,
-        25: 2.060,
-        26: 2.056,
-        27: 2.052,
-        28: 2.048,
-        29: 2.045,
-        30: 2.042,
-    }
+def get_usable_cores() -> List[int]:
+    # execute_benchmark.py exports the core it pinned the measurement phase to.
+    core = os.environ.get("LIBOQS_BENCH_CORE")
+    if core is not None and core.isdigit():
+        return [int(core)]
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+def get_default_jobs() -> int:
+    return max(1, len(get_usable_cores()))
 
-    if df in table:
-        return table[df]
-    if df <= 40:
-        return 2.021
-    if df <= 60:
-        return 2.000
-    return 1.960
 
+def get_scratch_dir(fallback: str) -> str:
+    shm_dir = "/dev/shm"
+    if os.path.isdir(shm_dir) and os.access(shm_dir, os.W_OK):
+        return shm_dir
+    return fallback
 
-def summary_with_ci(values: List[float]) -> Dict[str, float]:
-    """Return mean, std, ci_low, ci_high (95% CI, t-Student)."""
-    n = len(values)
-    mean = stats.mean(values)
+
+def summary_with_ci_vec(mat: np.ndarray) -> Dict[str, np.ndarray]:
+    """Column-wise mean, std, ci_low, ci_high (95% CI, t-Student) of an (n, k) matrix."""
+    n = mat.shape[0]
+    mean = mat.mean(axis=0)
     if n < 2:
         return {
             "mean": mean,
-            "std": 0.0,
+            "std": np.zeros_like(mean),
             "ci_low": mean,
             "ci_high": mean,
         }
 
-    s = stats.stdev(values)
-    df = n - 1
-    t = t_critical_95(df)
+    s = mat.std(axis=0, ddof=1)
+    t = t_crit_95(n - 1)
     margin = t * s / (n ** 0.5)
     return {
         "mean": mean,
@@ -153,41 +183,43 @@ def summary_with_ci(values: List[float]) -> Dict[str, float]:
     }
 
 
-def iqr_mask(values: List[float]) -> List[bool]:
+def iqr_mask(values: np.ndarray) -> np.ndarray:
     """Boolean mask indicating which values are kept after IQR filtering."""
-    n = len(values)
+    arr = np.asarray(values, dtype=np.float64)
+    n = arr.size
     if n < 4:
-        return [True] * n
-    qs = stats.quantiles(values, n=4, method="inclusive")
-    q1, q3 = qs[0], qs[2]
+        return np.ones(n, dtype=bool)
+    # Linear interpolation, equivalent to statistics.quantiles(method="inclusive").
+    q1, q3 = np.percentile(arr, [25, 75])
     iqr = q3 - q1
     lower = q1 - 1.5 * iqr
     upper = q3 + 1.5 * iqr
-    return [(lower <= v <= upper) for v in values]
+    return (arr >= lower) & (arr <= upper)
 
 
 def parse_ms_print_output(ms_output: str) -> Tuple[int, int, int, int, int]:
     """Extract peak snapshot metrics (insts, maxBytes, maxHeap, extHeap, maxStack) from ms_print output."""
-    lines = ms_output.splitlines()
     peak_index = -1
-
-    for line in lines:
-        if line.startswith(" Detailed snapshots: ["):
-            m = re.search(r"(\d+)\s+\(peak\)", line)
-            if m:
-                peak_index = int(m.group(1))
-                break
+    prefix = ""
+    peak_line = None
+    # phase 0: looking for the detailed-snapshots header; phase 1: looking for the peak row.
+    phase = 0
+
+    for line in io.StringIO(ms_output):
+        if phase == 0:
+            if line.startswith(_DETAILED_PREFIX):
+                m = _PEAK_RE.search(line)
+                if m:
+                    peak_index = int(m.group(1))
+                    prefix = f"{peak_index:>3d}"
+                    phase = 1
+        elif line.startswith(prefix):
+            peak_line = line.rstrip("\n")
+            break
 
     if peak_index < 0:
         raise RuntimeError("Could not find peak snapshot in ms_print output.")
 
-    peak_line = None
-    prefix = f"{peak_index:>3d}"
-    for line in lines:
-        if line.startswith(prefix):
-            peak_line = line
-            break
-
     if peak_line is None:
         raise RuntimeError("Peak snapshot line not found in ms_print output.")
 
@@ -200,20 +232,39 @@ def parse_ms_print_output(ms_output: str) -> Tuple[int, int, int, int, int]:
     return insts, maxBytes, maxHeap, extHeap, maxStack
 
 
-def run_massif_once(binary: str, alg: str, op_code: int, workdir: str) -> Dict[str, int]:
-    massif_out = os.path.join(workdir, "valgrind-out")
+def parse_massif_file(path: str) -> Tuple[int, int, int, int, int]:
+    """Extract peak snapshot metrics (insts, maxBytes, maxHeap, extHeap, maxStack) from a massif.out file."""
+    snapshot: Dict[str, int] = {}
+    peak: Dict[str, int] = {}
+
+    with open(path, "r") as f:
+        for line in f:
+            key, sep, value = line.partition("=")
+            if not sep:
+                continue
+            if key == "snapshot":
+                snapshot = {}
+            elif key in ("time", "mem_heap_B", "mem_heap_extra_B", "mem_stacks_B"):
+                snapshot[key] = int(value)
+            elif key == "heap_tree" and value.strip() == "peak":
+                peak = snapshot
+                break
 
-    cmd = [
-        "valgrind",
-        "--tool=massif",
-        "--stacks=yes",
-        f"--massif-out-file={massif_out}",
-        binary,
-        alg,
-        str(op_code),
-    ]
+    if not peak:
+        raise RuntimeError(f"Could not find peak snapshot in {path}.")
+    if len(peak) < 4:
+        raise RuntimeError(f"Incomplete peak snapshot in {path}: {peak}")
+
+    maxHeap = peak["mem_heap_B"]
+    extHeap = peak["mem_heap_extra_B"]
+    maxStack = peak["mem_stacks_B"]
+    maxBytes = maxHeap + extHeap + maxStack
+    return peak["time"], maxBytes, maxHeap, extHeap, maxStack
+
+
+def run_ms_print(massif_out: str, alg: str, op_code: int, workdir: str) -> Tuple[int, int, int, int, int]:
     proc = subprocess.run(
-        cmd,
+        ["ms_print", massif_out],
         cwd=workdir,
         capture_output=True,
         text=True,
@@ -221,32 +272,108 @@ def run_massif_once(binary: str, alg: str, op_code: int, workdir: str) -> Dict[s
 
     if proc.returncode != 0:
         print(
-            f"[ERROR] Valgrind/Massif failed for {alg}, op={op_code}, "
+            f"[ERROR] ms_print failed for {alg}, op={op_code}, "
             f"return code={proc.returncode}",
             file=sys.stderr,
         )
         print(proc.stdout, file=sys.stderr)
         print(proc.stderr, file=sys.stderr)
-        raise RuntimeError("Failed to execute valgrind/massif.")
+        raise RuntimeError("Failed to execute ms_print.")
 
-    proc2 = subprocess.run(
-        ["ms_print", massif_out],
-        cwd=workdir,
-        capture_output=True,
-        text=True,
+    return parse_ms_print_output(proc.stdout)
+
+
+def run_massif_pinned(
+    cores: Optional[queue.Queue],
+    binary: str,
+    alg: str,
+    op_code: int,
+    workdir: str,
+    **massif_opts: int,
+) -> Dict[str, int]:
+    """Run one Massif collection on a core taken from the shared pool, if any."""
+    if cores is None:
+        return run_massif_once(binary, alg, op_code, workdir, **massif_opts)
+    core = cores.get()
+    try:
+        return run_massif_once(binary, alg, op_code, workdir, core=core, **massif_opts)
+    finally:
+        cores.put(core)
+
+
+def run_massif_once(
+    binary: str,
+    alg: str,
+    op_code: int,
+    workdir: str,
+    core: Optional[int] = None,
+    detailed_freq: int = 1000000,
+    max_snapshots: int = 20,
+    peak_inaccuracy: float = 1.0,
+) -> Dict[str, int]:
+    # Unique output name so concurrent runs never clobber each other's Massif file;
+    # kept on tmpfs when available since it is only read back once.
+    massif_out = os.path.join(
+        get_scratch_dir(workdir), f"valgrind-out-{os.getpid()}-{uuid.uuid4().hex}"
     )
 
-    if proc2.returncode != 0:
-        print(
-            f"[ERROR] ms_print failed for {alg}, op={op_code}, "
-            f"return code={proc2.returncode}",
-            file=sys.stderr,
+    cmd = [
+        "valgrind",
+        "--tool=massif",
+        "--stacks=yes",
+        # Only the peak totals are used: skip allocation-tree walks and keep the
+        # snapshot buffer small. The peak snapshot is always recorded as detailed.
+        "--pages-as-heap=no",
+        "--depth=1",
+        f"--detailed-freq={detailed_freq}",
+        f"--max-snapshots={max_snapshots}",
+        # Pinned explicitly so results do not depend on the Valgrind release defaults;
+        # instruction time is the cheapest time unit to track.
+        "--time-unit=i",
+        f"--peak-inaccuracy={peak_inaccuracy}",
+        # No backtraces or debug info are needed for snapshot totals.
+        "--num-callers=1",
+        "--trace-children=no",
+        "--read-inline-info=no",
+        "--read-var-info=no",
+        # The liboqs test binaries never generate code at run time.
+        "--smc-check=none",
+        f"--massif-out-file={massif_out}",
+        binary,
+        alg,
+        str(op_code),
+    ]
+    if core is not None:
+        cmd = ["taskset", "-c", str(core)] + cmd
+    try:
+        proc = subprocess.run(
+            cmd,
+            cwd=workdir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
         )
-        print(proc2.stdout, file=sys.stderr)
-        print(proc2.stderr, file=sys.stderr)
-        raise RuntimeError("Failed to execute ms_print.")
 
-    insts, maxBytes, maxHeap, extHeap, maxStack = parse_ms_print_output(proc2.stdout)
+        if proc.returncode != 0:
+            print(
+                f"[ERROR] Valgrind/Massif failed for {alg}, op={op_code}, "
+                f"return code={proc.returncode}",
+                file=sys.stderr,
+            )
+            print(proc.stdout.decode(errors="replace"), file=sys.stderr)
+            print(proc.stderr.decode(errors="replace"), file=sys.stderr)
+            raise RuntimeError("Failed to execute valgrind/massif.")
+
+        try:
+            insts, maxBytes, maxHeap, extHeap, maxStack = parse_massif_file(massif_out)
+        except (RuntimeError, ValueError) as e:
+            print(f"[WARN] {e} Falling back to ms_print.", file=sys.stderr)
+            insts, maxBytes, maxHeap, extHeap, maxStack = run_ms_print(massif_out, alg, op_code, workdir)
+    finally:
+        try:
+            os.remove(massif_out)
+        except FileNotFoundError:
+            pass
+
     return {
         "insts": insts,
         "maxBytes": maxBytes,
@@ -256,6 +383,73 @@ def run_massif_once(binary: str, alg: str, op_code: int, workdir: str) -> Dict[s
     }
 
 
+def summarize_runs(runs: List[Dict[str, int]]) -> Dict[str, Any]:
+    """Build the raw samples and IQR-filtered summary (JSON layout) for one algorithm/operation."""
+    raw = np.empty((len(runs), 5), dtype=np.float64)
+    for i, res in enumerate(runs):
+        raw[i] = (
+            res["insts"],
+            res["maxBytes"] * _INV_MB,
+            res["maxHeap"] * _INV_MB,
+            res["extHeap"] * _INV_MB,
+            res["maxStack"] * _INV_MB,
+        )
+
+    n_raw = raw.shape[0]
+
+    mask = iqr_mask(raw[:, 1])
+    n_filt = int(mask.sum())
+    if n_filt < 3:
+        mask = np.ones(n_raw, dtype=bool)
+        n_filt = n_raw
+
+    summary = summary_with_ci_vec(raw[mask])
+    result: Dict[str, Any] = {
+        "raw": {key: raw[:, k].tolist() for k, key in enumerate(_METRIC_KEYS)},
+        "summary": {
+            "num_runs_raw": n_raw,
+            "num_runs_filtered": n_filt,
+        },
+    }
+    for k, key in enumerate(_METRIC_KEYS):
+        result["summary"][key] = {stat: float(col[k]) for stat, col in summary.items()}
+    return result
+
+
+def result_row(alg: str, op_name: str, result: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Flatten one summarize_runs() result into a CSV row (same order as the CSV header)."""
+    summary = result["summary"]
+    row: List[Any] = [alg, op_name, summary["num_runs_raw"], summary["num_runs_filtered"]]
+    for key in _METRIC_KEYS:
+        s = summary[key]
+        row.extend((s["mean"], s["std"], s["ci_low"], s["ci_high"]))
+    return tuple(row)
+
+
+def write_json_atomic(path: str, data: Dict[str, Any]) -> None:
+    """Rewrite path via a temporary file so an interrupted sweep never leaves a truncated JSON."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as jf:
+        json.dump(data, jf, indent=2)
+    os.replace(tmp_path, path)
+
+
+def checkpoint_path(ckpt_dir: str, alg: str, op_name: str) -> str:
+    return os.path.join(ckpt_dir, f"{alg}_{op_name}.json")
+
+
+def load_checkpoint(path: str, meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the checkpointed result at path, or None if missing, unreadable or from other settings."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("meta") != meta:
+        return None
+    return data.get("result")
+
+
 def main() -> None:
     args = parse_args()
     script_dir = get_script_dir()
@@ -302,19 +496,41 @@ def main() -> None:
         algorithms = alg_list
 
     os.makedirs(results_dir, exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    csv_path = os.path.join(results_dir, f"{csv_prefix}{ts}.csv")
-    json_path = os.path.join(results_dir, f"{json_prefix}{ts}.json")
+    # Microseconds plus the PID keep concurrent single-run invocations (see
+    # run_all_mem_bench.py --jobs) from ever sharing a file name.
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    run_id = f"{ts}_{os.getpid()}"
+    csv_path = os.path.join(results_dir, f"{csv_prefix}{run_id}.csv")
+    json_path = os.path.join(results_dir, f"{json_prefix}{run_id}.json")
+
+    if args.num_runs < 1:
+        print("[ERROR] --num-runs must be at least 1.", file=sys.stderr)
+        sys.exit(1)
+    if args.jobs < 1:
+        print("[ERROR] --jobs must be at least 1.", file=sys.stderr)
+        sys.exit(1)
+    if args.detailed_freq < 1 or args.max_snapshots < 10:
+        print(
+            "[ERROR] --detailed-freq must be at least 1 and --max-snapshots at least 10.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    if args.peak_inaccuracy < 0:
+        print("[ERROR] --peak-inaccuracy must not be negative.", file=sys.stderr)
+        sys.exit(1)
 
     print(
         f"[*] mode={mode}, binary={binary_name}, num_runs={args.num_runs}, "
-        f"algorithms={algorithms}"
+        f"jobs={args.jobs}, algorithms={algorithms}"
     )
 
     json_data: Dict[str, Any] = {
         "binary": binary_name,
         "mode": mode,
         "num_runs_requested": args.num_runs,
+        "detailed_freq": args.detailed_freq,
+        "max_snapshots": args.max_snapshots,
+        "peak_inaccuracy": args.peak_inaccuracy,
         "timestamp": ts,
         "results": {},
     }
@@ -346,101 +562,100 @@ def main() -> None:
         "maxStack_ci_high_mb",
     ]
 
-    rows: List[Dict[str, Any]] = []
-
-    for alg in algorithms:
-        json_data["results"][alg] = {}
-        for op_name, op_code in operations:
-            print(f"  -> {alg} / {op_name} ({args.num_runs} runs)")
-
-            insts_vals: List[float] = []
-            maxBytes_vals: List[float] = []
-            maxHeap_vals: List[float] = []
-            extHeap_vals: List[float] = []
-            maxStack_vals: List[float] = []
-
-            for _ in range(args.num_runs):
-                res = run_massif_once(binary_path, alg, op_code, binary_dir)
-                insts_vals.append(float(res["insts"]))
-                maxBytes_vals.append(float(res["maxBytes"]) / (1024.0 * 1024.0))
-                maxHeap_vals.append(float(res["maxHeap"]) / (1024.0 * 1024.0))
-                extHeap_vals.append(float(res["extHeap"]) / (1024.0 * 1024.0))
-                maxStack_vals.append(float(res["maxStack"]) / (1024.0 * 1024.0))
-
-            n_raw = len(insts_vals)
-
-            mask = iqr_mask(maxBytes_vals)
-            n_filt = sum(mask)
-            if n_filt < 3:
-                mask = [True] * n_raw
-                n_filt = n_raw
-
-            insts_f = [v for v, keep in zip(insts_vals, mask) if keep]
-            maxBytes_f = [v for v, keep in zip(maxBytes_vals, mask) if keep]
-            maxHeap_f = [v for v, keep in zip(maxHeap_vals, mask) if keep]
-            extHeap_f = [v for v, keep in zip(extHeap_vals, mask) if keep]
-            maxStack_f = [v for v, keep in zip(maxStack_vals, mask) if keep]
-
-            insts_s = summary_with_ci(insts_f)
-            maxBytes_s = summary_with_ci(maxBytes_f)
-            maxHeap_s = summary_with_ci(maxHeap_f)
-            extHeap_s = summary_with_ci(extHeap_f)
-            maxStack_s = summary_with_ci(maxStack_f)
-
-            json_data["results"][alg][op_name] = {
-                "raw": {
-                    "insts": insts_vals,
-                    "maxBytes_mb": maxBytes_vals,
-                    "maxHeap_mb": maxHeap_vals,
-                    "extHeap_mb": extHeap_vals,
-                    "maxStack_mb": maxStack_vals,
-                },
-                "summary": {
-                    "num_runs_raw": n_raw,
-                    "num_runs_filtered": n_filt,
-                    "insts": insts_s,
-                    "maxBytes_mb": maxBytes_s,
-                    "maxHeap_mb": maxHeap_s,
-                    "extHeap_mb": extHeap_s,
-                    "maxStack_mb": maxStack_s,
-                },
-            }
-
-            row = {
-                "algorithm": alg,
-                "operation": op_name,
-                "num_runs_raw": n_raw,
-                "num_runs_filtered": n_filt,
-                "insts_mean": insts_s["mean"],
-                "insts_std": insts_s["std"],
-                "insts_ci_low": insts_s["ci_low"],
-                "insts_ci_high": insts_s["ci_high"],
-                "maxBytes_mean_mb": maxBytes_s["mean"],
-                "maxBytes_std_mb": maxBytes_s["std"],
-                "maxBytes_ci_low_mb": maxBytes_s["ci_low"],
-                "maxBytes_ci_high_mb": maxBytes_s["ci_high"],
-                "maxHeap_mean_mb": maxHeap_s["mean"],
-                "maxHeap_std_mb": maxHeap_s["std"],
-                "maxHeap_ci_low_mb": maxHeap_s["ci_low"],
-                "maxHeap_ci_high_mb": maxHeap_s["ci_high"],
-                "extHeap_mean_mb": extHeap_s["mean"],
-                "extHeap_std_mb": extHeap_s["std"],
-                "extHeap_ci_low_mb": extHeap_s["ci_low"],
-                "extHeap_ci_high_mb": extHeap_s["ci_high"],
-                "maxStack_mean_mb": maxStack_s["mean"],
-                "maxStack_std_mb": maxStack_s["std"],
-                "maxStack_ci_low_mb": maxStack_s["ci_low"],
-                "maxStack_ci_high_mb": maxStack_s["ci_high"],
-            }
-            rows.append(row)
-
-    with open(csv_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-
-    with open(json_path, "w") as jf:
-        json.dump(json_data, jf, indent=2)
+    pairs = [(alg, op_name) for alg in algorithms for op_name, _ in operations]
+    ckpt_dir = os.path.join(results_dir, "ckpt")
+    ckpt_meta = {
+        "binary": binary_name,
+        "num_runs": args.num_runs,
+        "detailed_freq": args.detailed_freq,
+        "max_snapshots": args.max_snapshots,
+        "peak_inaccuracy": args.peak_inaccuracy,
+    }
+    resumed: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    if args.resume:
+        os.makedirs(ckpt_dir, exist_ok=True)
+        for alg, op_name in pairs:
+            result = load_checkpoint(checkpoint_path(ckpt_dir, alg, op_name), ckpt_meta)
+            if result is not None:
+                resumed[(alg, op_name)] = result
+        print(f"[*] Resume: {len(resumed)}/{len(pairs)} pair(s) restored from {ckpt_dir}")
+
+    jobs = [
+        (alg, op_name, op_code, i)
+        for alg in algorithms
+        for op_name, op_code in operations
+        if (alg, op_name) not in resumed
+        for i in range(args.num_runs)
+    ]
+    samples: Dict[Tuple[str, str], List[Dict[str, int]]] = {
+        pair: [{} for _ in range(args.num_runs)] for pair in pairs
+    }
+    # Pairs are finalized in sweep order as soon as all of their runs are done,
+    # so partial results survive an interrupted sweep.
+    remaining = {pair: 0 if pair in resumed else args.num_runs for pair in pairs}
+    next_pair = 0
+
+    # Parallel workers each get a dedicated core so co-scheduled Valgrind
+    # processes do not migrate and thrash each other's caches.
+    cores: Optional[queue.Queue] = None
+    if args.jobs > 1 and shutil.which("taskset") is not None:
+        cores = queue.Queue()
+        for core in get_usable_cores():
+            cores.put(core)
+
+    print(f"[*] Dispatching {len(jobs)} Massif run(s) on {args.jobs} worker(s)")
+    with open(csv_path, "w", newline="") as f, ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+
+        def finalize_ready_pairs() -> None:
+            nonlocal next_pair
+            while next_pair < len(pairs) and remaining[pairs[next_pair]] == 0:
+                pair_alg, pair_op = pairs[next_pair]
+                result = resumed.get((pair_alg, pair_op))
+                if result is None:
+                    result = summarize_runs(samples[(pair_alg, pair_op)])
+                    if args.resume:
+                        write_json_atomic(
+                            checkpoint_path(ckpt_dir, pair_alg, pair_op),
+                            {"meta": ckpt_meta, "result": result},
+                        )
+                json_data["results"].setdefault(pair_alg, {})[pair_op] = result
+                writer.writerow(result_row(pair_alg, pair_op, result))
+                f.flush()
+                write_json_atomic(json_path, json_data)
+                next_pair += 1
+
+        finalize_ready_pairs()
+        futures = {
+            executor.submit(
+                run_massif_pinned,
+                cores,
+                binary_path,
+                alg,
+                op_code,
+                binary_dir,
+                detailed_freq=args.detailed_freq,
+                max_snapshots=args.max_snapshots,
+                peak_inaccuracy=args.peak_inaccuracy,
+            ): (alg, op_name, i)
+            for alg, op_name, op_code, i in jobs
+        }
+        try:
+            for done, fut in enumerate(as_completed(futures), start=1):
+                alg, op_name, i = futures[fut]
+                samples[(alg, op_name)][i] = fut.result()
+                remaining[(alg, op_name)] -= 1
+                print(f"  [{done}/{len(jobs)}] {alg} / {op_name} (run {i+1}/{args.num_runs})")
+                finalize_ready_pairs()
+        except BaseException:
+            for fut in futures:
+                fut.cancel()
+            raise
+
+    write_json_atomic(json_path, json_data)
+    if args.resume:
+        shutil.rmtree(ckpt_dir, ignore_errors=True)
 
     print(f"[OK] CSV saved to:  {csv_path}")
     print(f"[OK] JSON saved to: {json_path}")
@@ -1,119 +1,153 @@
 #!/usr/bin/env python3
 import os
-import glob
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 import numpy as np
 import pandas as pd
 
-script_dir = os.path.dirname(os.path.abspath(__file__))
-results_dir = os.path.join(script_dir, "results_mem_sig")
-
-if not os.path.isdir(results_dir):
-    raise SystemExit(f"[ERROR] Results directory not found: {results_dir}")
-
-pattern = os.path.join(results_dir, "results_sig_mem_*.csv")
-csv_files = glob.glob(pattern)
-
-if not csv_files:
-    raise SystemExit(f"[ERROR] No CSV files found matching {pattern}")
-
-csv_file = max(csv_files, key=os.path.getmtime)
-print(f"[*] Using newest SIG CSV: {csv_file}")
-
-df = pd.read_csv(csv_file)
-
-algorithms_to_plot = list(df["algorithm"].unique())
-
 
 def disp_name(alg: str) -> str:
     return alg
 
 
+def add_error_whiskers(ax, xs, lo, hi, capsize=5):
+    """Draw CI whiskers for a bar series as one LineCollection plus cap markers."""
+    segments = np.stack([np.column_stack([xs, lo]), np.column_stack([xs, hi])], axis=1)
+    ax.add_collection(LineCollection(segments, colors="black", linewidths=1.5))
+    for ys in (lo, hi):
+        ax.plot(
+            xs, ys, linestyle="none", marker="_", markersize=2 * capsize,
+            markeredgewidth=1.0, color="black",
+        )
+
+
 title_map = {
     "keygen": "Geração de Chaves",
     "sign": "Assinatura",
     "verify": "Verificação",
 }
 
-operations = ["keygen", "sign", "verify"]
-
-for op in operations:
-    heap_vals = []
-    stack_vals = []
-    heap_low_err = []
-    heap_high_err = []
-    stack_low_err = []
-    stack_high_err = []
-    names = []
+_SUBPLOT_PARAMS = ("left", "right", "bottom", "top", "wspace", "hspace")
 
-    for alg in algorithms_to_plot:
-        row = df[(df["algorithm"] == alg) & (df["operation"] == op)]
-        if row.empty:
-            continue
-        row = row.iloc[0]
-
-        heap = row["maxHeap_mean_mb"]
-        stack = row["maxStack_mean_mb"]
-
-        names.append(disp_name(alg))
-        heap_vals.append(heap)
-        stack_vals.append(stack)
-
-        heap_low = row["maxHeap_ci_low_mb"]
-        heap_high = row["maxHeap_ci_high_mb"]
-        heap_low_err.append(heap - heap_low)
-        heap_high_err.append(heap_high - heap)
-
-        stack_low = row["maxStack_ci_low_mb"]
-        stack_high = row["maxStack_ci_high_mb"]
-        stack_low_err.append(stack - stack_low)
-        stack_high_err.append(stack_high - stack)
+operations = ["keygen", "sign", "verify"]
 
-    heap_arr = np.array(heap_vals)
-    stack_arr = np.array(stack_vals)
 
-    heap_err = np.vstack([heap_low_err, heap_high_err])
-    stack_err = np.vstack([stack_low_err, stack_high_err])
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    results_dir = os.path.join(script_dir, "results_mem_sig")
+
+    if not os.path.isdir(results_dir):
+        raise SystemExit(f"[ERROR] Results directory not found: {results_dir}")
+
+    prefix = "results_sig_mem_"
+    with os.scandir(results_dir) as it:
+        csv_entries = [
+            e for e in it
+            if e.name.startswith(prefix) and e.name.endswith(".csv")
+        ]
+
+    if not csv_entries:
+        pattern = os.path.join(results_dir, f"{prefix}*.csv")
+        raise SystemExit(f"[ERROR] No CSV files found matching {pattern}")
+
+    csv_file = max(csv_entries, key=lambda e: e.stat().st_mtime).path
+    print(f"[*] Using newest SIG CSV: {csv_file}")
+
+    value_cols = [
+        "maxHeap_mean_mb", "maxHeap_ci_low_mb", "maxHeap_ci_high_mb",
+        "maxStack_mean_mb", "maxStack_ci_low_mb", "maxStack_ci_high_mb",
+    ]
+    df = pd.read_csv(
+        csv_file,
+        usecols=["algorithm", "operation", *value_cols],
+        dtype={"algorithm": "category", "operation": "category",
+               **{col: "float64" for col in value_cols}},
+        memory_map=True,
+    )
 
-    x = np.arange(len(names))
-    width = 0.35
+    algorithms_to_plot = list(df["algorithm"].unique())
 
     fig, ax = plt.subplots(figsize=(12, 6))
 
-    ax.bar(
-        x - width / 2,
-        heap_arr,
-        width,
-        label="Heap",
-        yerr=heap_err,
-        capsize=5,
-        edgecolor="black",
-    )
-    ax.bar(
-        x + width / 2,
-        stack_arr,
-        width,
-        label="Stack",
-        yerr=stack_err,
-        capsize=5,
-        edgecolor="black",
-    )
-
-    ax.set_title(
-        f"Uso de Memória (Heap vs. Stack) — {title_map[op]}",
-        fontsize=18,
-    )
-    ax.set_ylabel("Memória (MB)", fontsize=18)
-    ax.set_xticks(x)
-    ax.set_xticklabels(names, rotation=90, ha="center", fontsize=14)
-    ax.tick_params(axis="y", labelsize=14)
-    ax.grid(True, which="both", linestyle="--", linewidth=0.5, axis="y")
-    ax.legend(fontsize=14)
-
-    plt.tight_layout()
-
-    base = f"memory_usage_sig_{op}"
-    for ext in ("png", "svg", "pdf"):
-        fname = os.path.join(results_dir, f"{base}.{ext}")
-        plt.savefig(fname, dpi=300, bbox_inches="tight")
-        print(f"Saved {fname}")
+    for op in operations:
+        ax.clear()
+        # tight_layout starts from the current subplot params, so reset them
+        # to a fresh figure's defaults to lay out every operation the same way.
+        fig.subplots_adjust(
+            **{name: plt.rcParams[f"figure.subplot.{name}"] for name in _SUBPLOT_PARAMS}
+        )
+        sub = (
+            df[df["operation"] == op]
+            .drop_duplicates("algorithm")
+            .set_index("algorithm")
+            .reindex(algorithms_to_plot)
+            .dropna(subset=["maxHeap_mean_mb"])
+        )
+
+        names = [disp_name(alg) for alg in sub.index]
+        heap_arr = sub["maxHeap_mean_mb"].to_numpy()
+        stack_arr = sub["maxStack_mean_mb"].to_numpy()
+
+        heap_err = np.vstack([
+            (sub["maxHeap_mean_mb"] - sub["maxHeap_ci_low_mb"]).to_numpy(),
+            (sub["maxHeap_ci_high_mb"] - sub["maxHeap_mean_mb"]).to_numpy(),
+        ])
+        stack_err = np.vstack([
+            (sub["maxStack_mean_mb"] - sub["maxStack_ci_low_mb"]).to_numpy(),
+            (sub["maxStack_ci_high_mb"] - sub["maxStack_mean_mb"]).to_numpy(),
+        ])
+
+        x = np.arange(len(names))
+        width = 0.35
+
+        ax.bar(
+            x - width / 2,
+            heap_arr,
+            width,
+            label="Heap",
+            edgecolor="black",
+        )
+        add_error_whiskers(
+            ax,
+            x - width / 2,
+            heap_arr - heap_err[0],
+            heap_arr + heap_err[1],
+        )
+        ax.bar(
+            x + width / 2,
+            stack_arr,
+            width,
+            label="Stack",
+            edgecolor="black",
+        )
+        add_error_whiskers(
+            ax,
+            x + width / 2,
+            stack_arr - stack_err[0],
+            stack_arr + stack_err[1],
+        )
+
+        ax.set_title(
+            f"Uso de Memória (Heap vs. Stack) — {title_map[op]}",
+            fontsize=18,
+        )
+        ax.set_ylabel("Memória (MB)", fontsize=18)
+        ax.set_xticks(x)
+        ax.set_xticklabels(names, rotation=90, ha="center", fontsize=14)
+        ax.tick_params(axis="y", labelsize=14)
+        ax.grid(True, which="both", linestyle="--", linewidth=0.5, axis="y")
+        ax.legend(fontsize=14)
+
+        fig.tight_layout()
+
+        base = f"memory_usage_sig_{op}"
+        for ext in ("pdf", "svg", "png"):
+            fname = os.path.join(results_dir, f"{base}.{ext}")
+            fig.savefig(fname, dpi=300, bbox_inches="tight")
+            print(f"Saved {fname}")
+
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 import argparse
-import csv
-import glob
 import os
-import statistics as stats
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Tuple, Any
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from stats_utils import t_crit_95
 
 
 def parse_args() -> argparse.Namespace:
@@ -25,6 +28,46 @@ def parse_args() -> argparse.Namespace:
         default=20,
         help="Number of independent executions per algorithm/operation (default: 20)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of whole collect_mem_massif.py runs executed concurrently (default: 1). "
+            "With 1, each run spreads its own Massif jobs over all usable CPUs; above 1, "
+            "every run is forced to -j 1 and its output is captured."
+        ),
+    )
+    parser.add_argument(
+        "--parallel-suites",
+        action="store_true",
+        help=(
+            "Collect the KEM and SIG suites at the same time instead of one after the other. "
+            "Both suites then share host CPU and RAM, and their output is interleaved."
+        ),
+    )
+    parser.add_argument(
+        "--massif-detailed-freq",
+        type=int,
+        default=None,
+        help="Forwarded to collect_mem_massif.py as --detailed-freq (default: its tuned value)",
+    )
+    parser.add_argument(
+        "--massif-max-snapshots",
+        type=int,
+        default=None,
+        help="Forwarded to collect_mem_massif.py as --max-snapshots (default: its tuned value)",
+    )
+    parser.add_argument(
+        "--massif-peak-inaccuracy",
+        type=float,
+        default=None,
+        help=(
+            "Forwarded to collect_mem_massif.py as --peak-inaccuracy (default: its value, 1.0). "
+            "Higher values are faster but may under-report the peak by that percentage."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -34,89 +77,6 @@ def get_script_dir() -> str:
     return os.getcwd()
 
 
-def t_critical_95(df: int) -> float:
-    """Two-tailed 95% t critical value (alpha=0.05)."""
-    if df <= 1:
-        return 0.0
-
-    table = {
-        2: 4.303,
-        3: 3.182,
-        4: 2.776,
-        5: 2.571,
-        6: 2.447,
-        7: 2.365,
-        8: 2.306,
-        9: 2.262,
-        10: 2.228,
-        11: 2.201,
-        12: 2.179,
-        13: 2.160,
-        14: 2.145,
-        15: 2.131,
-        16: 2.120,
-        17: 2.110,
-        18: 2.101,
-        19: 2.093,
-        20: 2.086,
-        21: 2.080,
-        22: 2.074,
-        23: 2.069,
-        24: 2.064,
-        25: 2.060,
-        26: 2.056,
-        27: 2.052,
-        28: 2.048,
-        29: 2.045,
-        30: 2.042,
-    }
-
-    if df in table:
-        return table[df]
-    if df <= 40:
-        return 2.021
-    if df <= 60:
-        return 2.000
-    return 1.960
-
-
-def summary_with_ci(values: List[float]) -> Dict[str, float]:
-    """Return mean, std, ci_low, ci_high (95% CI, t-Student)."""
-    n = len(values)
-    mean = stats.mean(values)
-    if n < 2:
-        return {
-            "mean": mean,
-            "std": 0.0,
-            "ci_low": mean,
-            "ci_high": mean,
-        }
-
-    s = stats.stdev(values)
-    df = n - 1
-    t = t_critical_95(df)
-    margin = t * s / (n ** 0.5)
-    return {
-        "mean": mean,
-        "std": s,
-        "ci_low": mean - margin,
-        "ci_high": mean + margin,
-    }
-
-
-def iqr_mask(values: List[float]) -> List[bool]:
-    """Boolean mask indicating which values are kept after IQR filtering."""
-    n = len(values)
-    if n < 4:
-        return [True] * n
-    qs = stats.quantiles(values, n=4, method="inclusive")
-    q1, q3 = qs[0], qs[2]
-    iqr = q3 - q1
-    lower = q1 - 1.5 * iqr
-    upper = q3 + 1.5 * iqr
-    return [(lower <= v <= upper) for v in values]
-
-
 def aggregate_mem_results(results_dir: str, prefix: str, num_runs: int) -> None:
     """
     Read the N most recent CSVs in results_dir matching prefix*.csv, treat each line
@@ -124,14 +84,23 @@ def aggregate_mem_results(results_dir: str, prefix: str, num_runs: int) -> None:
     maxBytes as reference, compute mean/std/95% CI, and write a final CSV matching
     the collect_mem_massif.py format while removing the temporary CSV/JSON files.
     """
-    pattern = os.path.join(results_dir, f"{prefix}*.csv")
-    csv_files = sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True)
+    # is_file() is answered from the directory listing (d_type), so each entry
+    # costs a single stat for its mtime.
+    with os.scandir(results_dir) as it:
+        entries = [
+            (e.stat().st_mtime, e.path)
+            for e in it
+            if e.name.startswith(prefix) and e.name.endswith(".csv") and e.is_file()
+        ]
+    entries.sort(reverse=True)
+    # (csv, json) pairs; each per-run CSV has a JSON sibling with the same stem.
+    run_files = [(path, path[: -len(".csv")] + ".json") for _, path in entries]
 
-    if not csv_files:
+    if not run_files:
         print(f"[WARN] No CSV files found in {results_dir} with prefix {prefix}; nothing to aggregate.")
         return
 
-    used_files = csv_files[:num_runs]
+    used_files = run_files[:num_runs]
     if len(used_files) < num_runs:
         print(
             f"[WARN] Found only {len(used_files)} CSVs but num_runs={num_runs}. Using all available files."
@@ -139,31 +108,6 @@ def aggregate_mem_results(results_dir: str, prefix: str, num_runs: int) -> None:
 
     print(f"[*] Aggregating {len(used_files)} CSV(s) in {results_dir} (prefix={prefix})")
 
-    data: Dict[Tuple[str, str], Dict[str, List[float]]] = {}
-
-    for fpath in used_files:
-        with open(fpath, "r", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                alg = row["algorithm"]
-                op = row["operation"]
-                key = (alg, op)
-                if key not in data:
-                    data[key] = {
-                        "insts": [],
-                        "maxBytes": [],
-                        "maxHeap": [],
-                        "extHeap": [],
-                        "maxStack": [],
-                    }
-
-                d = data[key]
-                d["insts"].append(float(row["insts_mean"]))
-                d["maxBytes"].append(float(row["maxBytes_mean_mb"]))
-                d["maxHeap"].append(float(row["maxHeap_mean_mb"]))
-                d["extHeap"].append(float(row["extHeap_mean_mb"]))
-                d["maxStack"].append(float(row["maxStack_mean_mb"]))
-
     fieldnames = [
         "algorithm",
         "operation",
@@ -191,89 +135,99 @@ def aggregate_mem_results(results_dir: str, prefix: str, num_runs: int) -> None:
         "maxStack_ci_high_mb",
     ]
 
-    rows: List[Dict[str, Any]] = []
-
-    for (alg, op), metrics in sorted(data.items(), key=lambda x: (x[0][0], x[0][1])):
-        maxBytes_vals = metrics["maxBytes"]
-        n_raw = len(maxBytes_vals)
-
-        mask = iqr_mask(maxBytes_vals)
-        n_filt = sum(mask)
-        if n_filt < 3:
-            mask = [True] * n_raw
-            n_filt = n_raw
-
-        def filt(lst: List[float]) -> List[float]:
-            return [v for v, keep in zip(lst, mask) if keep]
-
-        insts_f = filt(metrics["insts"])
-        maxBytes_f = filt(metrics["maxBytes"])
-        maxHeap_f = filt(metrics["maxHeap"])
-        extHeap_f = filt(metrics["extHeap"])
-        maxStack_f = filt(metrics["maxStack"])
-
-        insts_s = summary_with_ci(insts_f)
-        maxBytes_s = summary_with_ci(maxBytes_f)
-        maxHeap_s = summary_with_ci(maxHeap_f)
-        extHeap_s = summary_with_ci(extHeap_f)
-        maxStack_s = summary_with_ci(maxStack_f)
-
-        row = {
-            "algorithm": alg,
-            "operation": op,
-            "num_runs_raw": n_raw,
-            "num_runs_filtered": n_filt,
-            "insts_mean": insts_s["mean"],
-            "insts_std": insts_s["std"],
-            "insts_ci_low": insts_s["ci_low"],
-            "insts_ci_high": insts_s["ci_high"],
-            "maxBytes_mean_mb": maxBytes_s["mean"],
-            "maxBytes_std_mb": maxBytes_s["std"],
-            "maxBytes_ci_low_mb": maxBytes_s["ci_low"],
-            "maxBytes_ci_high_mb": maxBytes_s["ci_high"],
-            "maxHeap_mean_mb": maxHeap_s["mean"],
-            "maxHeap_std_mb": maxHeap_s["std"],
-            "maxHeap_ci_low_mb": maxHeap_s["ci_low"],
-            "maxHeap_ci_high_mb": maxHeap_s["ci_high"],
-            "extHeap_mean_mb": extHeap_s["mean"],
-            "extHeap_std_mb": extHeap_s["std"],
-            "extHeap_ci_low_mb": extHeap_s["ci_low"],
-            "extHeap_ci_high_mb": extHeap_s["ci_high"],
-            "maxStack_mean_mb": maxStack_s["mean"],
-            "maxStack_std_mb": maxStack_s["std"],
-            "maxStack_ci_low_mb": maxStack_s["ci_low"],
-            "maxStack_ci_high_mb": maxStack_s["ci_high"],
-        }
-        rows.append(row)
+    keys = ["algorithm", "operation"]
+    value_cols = [
+        "insts_mean",
+        "maxBytes_mean_mb",
+        "maxHeap_mean_mb",
+        "extHeap_mean_mb",
+        "maxStack_mean_mb",
+    ]
+    frames = [
+        pd.read_csv(
+            csv_path,
+            usecols=keys + value_cols,
+            dtype={"algorithm": str, "operation": str, **{col: "float64" for col in value_cols}},
+            float_precision="round_trip",
+        )
+        for csv_path, _ in used_files
+    ]
+    big = pd.concat(frames, ignore_index=True)
+
+    # IQR filter on maxBytes within each (algorithm, operation) group; groups
+    # with fewer than 4 samples, or fewer than 3 survivors, are kept whole.
+    ref = big.groupby(keys)["maxBytes_mean_mb"]
+    q1 = ref.transform("quantile", 0.25)
+    q3 = ref.transform("quantile", 0.75)
+    iqr = q3 - q1
+    keep = big["maxBytes_mean_mb"].between(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+    keep |= ref.transform("size") < 4
+    keep |= keep.groupby([big[k] for k in keys]).transform("sum") < 3
+
+    # sort=True yields rows already ordered by (algorithm, operation) for output.
+    agg = big[keep].groupby(keys, sort=True)[value_cols].agg(["mean", "std", "count"])
+    n_filt = agg[(value_cols[0], "count")]
+    n_arr = n_filt.to_numpy()
+    # Same critical values as collect_mem_massif.summary_with_ci_vec: any group
+    # with at least two samples gets t(n - 1); a single sample gets no interval.
+    half_width = np.where(n_arr >= 2, t_crit_95(n_arr - 1), 0.0) / np.sqrt(n_arr)
+
+    out = pd.DataFrame({"num_runs_raw": ref.size(), "num_runs_filtered": n_filt})
+    for col in value_cols:
+        name, unit = col.split("_mean")
+        mean = agg[(col, "mean")]
+        std = agg[(col, "std")].fillna(0.0)
+        margin = half_width * std
+        out[f"{name}_mean{unit}"] = mean
+        out[f"{name}_std{unit}"] = std
+        out[f"{name}_ci_low{unit}"] = mean - margin
+        out[f"{name}_ci_high{unit}"] = mean + margin
 
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     final_csv = os.path.join(results_dir, f"{prefix}{ts}.csv")
 
     os.makedirs(results_dir, exist_ok=True)
-    with open(final_csv, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    out.reset_index()[fieldnames].to_csv(final_csv, index=False)
 
     print(f"[OK] Aggregated CSV saved to: {final_csv}")
 
-    for fpath in used_files:
-        try:
-            base = os.path.splitext(os.path.basename(fpath))[0]
-            json_path = os.path.join(results_dir, base + ".json")
-            os.remove(fpath)
-            if os.path.exists(json_path):
-                os.remove(json_path)
-        except OSError as e:
-            print(f"[WARN] Could not remove temporary file {fpath}: {e}")
+    for pair in used_files:
+        for path in pair:
+            # unlink directly; a missing file (usually the JSON) is not an error.
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[WARN] Could not remove temporary file {path}: {e}")
 
     print("[OK] Temporary CSV/JSON files removed.")
 
 
-def run_collect(script_dir: str, binary_name: str, num_runs: int) -> None:
+def run_collect_once(cmd: List[str], script_dir: str, capture: bool) -> subprocess.CompletedProcess:
+    """Run one collection; when capturing, its combined output is drained by communicate()."""
+    pipe = subprocess.PIPE if capture else None
+    with subprocess.Popen(
+        cmd,
+        cwd=script_dir,
+        stdout=pipe,
+        stderr=subprocess.STDOUT if capture else None,
+        text=True,
+    ) as proc:
+        output, _ = proc.communicate()
+    return subprocess.CompletedProcess(cmd, proc.returncode, output)
+
+
+def run_collect(
+    script_dir: str,
+    binary_name: str,
+    num_runs: int,
+    jobs: int = 1,
+    extra_args: Optional[List[str]] = None,
+) -> None:
     """
     For the given binary (test_kem_mem or test_sig_mem):
-      - run collect_mem_massif.py num_runs times, each with -n 1
+      - run collect_mem_massif.py num_runs times, each with -n 1, up to jobs at a time
       - aggregate the generated CSVs into a single final CSV.
     """
     project_root = os.path.abspath(os.path.join(script_dir, os.pardir))
@@ -312,23 +266,47 @@ def run_collect(script_dir: str, binary_name: str, num_runs: int) -> None:
 
     os.makedirs(results_dir, exist_ok=True)
 
-    for i in range(num_runs):
-        cmd = [
-            sys.executable,
-            collect_script,
-            binary_path,
-            "-n",
-            "1",
-        ]
-        print(f"[*] ({mode}) Run {i+1}/{num_runs}: {' '.join(cmd)}")
-        proc = subprocess.run(cmd, cwd=script_dir)
-        if proc.returncode != 0:
-            print(
-                f"[ERROR] collect_mem_massif.py failed for {binary_name} "
-                f"on run {i+1} with code {proc.returncode}",
-                file=sys.stderr,
-            )
-            return
+    cmd = [
+        sys.executable,
+        collect_script,
+        binary_path,
+        "-n",
+        "1",
+    ]
+    cmd += extra_args or []
+    # Concurrent executions already fill the cores, so each one runs its
+    # Massif jobs serially; their output is captured to keep logs readable.
+    capture = jobs > 1
+    if capture:
+        cmd += ["-j", "1"]
+
+    # More concurrent Valgrind processes than usable CPUs only adds contention.
+    try:
+        usable_cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        usable_cpus = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, num_runs, usable_cpus))) as executor:
+        futures = {}
+        for i in range(num_runs):
+            print(f"[*] ({mode}) Run {i+1}/{num_runs}: {' '.join(cmd)}")
+            futures[executor.submit(run_collect_once, cmd, script_dir, capture)] = i
+
+        for fut in as_completed(futures):
+            i = futures[fut]
+            proc = fut.result()
+            if proc.returncode != 0:
+                for pending in futures:
+                    pending.cancel()
+                if capture:
+                    print(proc.stdout, file=sys.stderr)
+                print(
+                    f"[ERROR] collect_mem_massif.py failed for {binary_name} "
+                    f"on run {i+1} with code {proc.returncode}",
+                    file=sys.stderr,
+                )
+                return
+            if capture:
+                print(f"[*] ({mode}) Run {i+1}/{num_runs} finished")
 
     aggregate_mem_results(results_dir, prefix, num_runs)
 
@@ -337,11 +315,33 @@ def main() -> None:
     args = parse_args()
     script_dir = get_script_dir()
 
-    print("\n=== KEM: test_kem_mem ===")
-    run_collect(script_dir, "test_kem_mem", args.num_runs)
+    if args.jobs < 1:
+        print("[ERROR] --jobs must be at least 1.", file=sys.stderr)
+        sys.exit(1)
+
+    extra_args: List[str] = []
+    if args.massif_detailed_freq is not None:
+        extra_args += ["--detailed-freq", str(args.massif_detailed_freq)]
+    if args.massif_max_snapshots is not None:
+        extra_args += ["--max-snapshots", str(args.massif_max_snapshots)]
+    if args.massif_peak_inaccuracy is not None:
+        extra_args += ["--peak-inaccuracy", str(args.massif_peak_inaccuracy)]
+
+    if args.parallel_suites:
+        print("\n=== KEM + SIG: test_kem_mem and test_sig_mem in parallel ===")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(run_collect, script_dir, binary, args.num_runs, args.jobs, extra_args)
+                for binary in ("test_kem_mem", "test_sig_mem")
+            ]
+            for fut in futures:
+                fut.result()
+    else:
+        print("\n=== KEM: test_kem_mem ===")
+        run_collect(script_dir, "test_kem_mem", args.num_runs, args.jobs, extra_args)
 
-    print("\n=== SIG: test_sig_mem ===")
-    run_collect(script_dir, "test_sig_mem", args.num_runs)
+        print("\n=== SIG: test_sig_mem ===")
+        run_collect(script_dir, "test_sig_mem", args.num_runs, args.jobs, extra_args)
 
     print("\n[OK] Completed KEM and SIG memory runs with aggregation.")
 
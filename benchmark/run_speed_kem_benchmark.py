@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 import argparse
-import csv
 import math
 import os
+import queue
 import re
 import subprocess
 import sys
+import threading
 from collections import defaultdict
-from statistics import mean, stdev
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
+from stats_utils import t_crit_95
+
 ALGORITHMS = [
     "ML-KEM-512",
     "ML-KEM-768",
@@ -30,64 +36,55 @@ ALGORITHMS = [
 
 OPERATIONS = ["keygen", "encaps", "decaps"]
 
-T_CRIT_95 = {
-    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571,
-    6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228,
-    11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
-    16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086,
-    21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060,
-    26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042,
-}
-
+SIZE_FIELDS = [
+    "public_key_bytes",
+    "ciphertext_bytes",
+    "secret_key_bytes",
+    "shared_secret_bytes",
+    "nist_level",
+]
 
-def percentile(sorted_vals, p):
-    if not sorted_vals:
-        return float("nan")
-    if len(sorted_vals) == 1:
-        return sorted_vals[0]
-    k = (len(sorted_vals) - 1) * (p / 100.0)
-    f = math.floor(k)
-    c = math.ceil(k)
-    if f == c:
-        return sorted_vals[int(k)]
-    d0 = sorted_vals[f] * (c - k)
-    d1 = sorted_vals[c] * (k - f)
-    return d0 + d1
+_OP_PREFIXES = tuple(OPERATIONS)
+_OP_RE = re.compile(r"^(keygen|encaps|decaps)\s*\|(.*)$")
+_SIZES_RE = re.compile(
+    r"public key bytes:\s*(\d+),\s*ciphertext bytes:\s*(\d+),\s*secret key bytes:\s*(\d+),\s*shared secret key bytes:\s*(\d+),\s*NIST level:\s*([0-9]+)"
+)
 
 
-def iqr_filter_indices(values):
-    n = len(values)
+def iqr_keep_mask(values):
+    n = values.size
     if n < 4:
-        return list(range(n))
-    sorted_vals = sorted(values)
-    q1 = percentile(sorted_vals, 25)
-    q3 = percentile(sorted_vals, 75)
+        return np.ones(n, dtype=bool)
+    # np.percentile selects the quartiles with a partial sort (introselect), so
+    # there is no full sort before building the mask.
+    q1, q3 = np.percentile(values, [25, 75])
     iqr = q3 - q1
     if iqr == 0:
-        return list(range(n))
+        return np.ones(n, dtype=bool)
     lower = q1 - 1.5 * iqr
     upper = q3 + 1.5 * iqr
-    keep = [i for i, v in enumerate(values) if lower <= v <= upper]
-    return keep
+    # Fences are inclusive: samples lying exactly on Q1 - 1.5*IQR or
+    # Q3 + 1.5*IQR are kept.
+    return (values >= lower) & (values <= upper)
 
 
-def t_crit_95(df):
-    if df <= 0:
-        return float("nan")
-    if df in T_CRIT_95:
-        return T_CRIT_95[df]
-    return 1.96
+def tee_lines(lines, sink):
+    for line in lines:
+        sink.append(line)
+        yield line
 
 
-def parse_speed_kem_output(text):
+def parse_speed_kem_output(lines):
     ops = {}
     sizes = {}
-    lines = text.splitlines()
     for line in lines:
-        m = re.match(r"^(keygen|encaps|decaps)\s*\|(.*)$", line)
-        if m:
+        if line.startswith(_OP_PREFIXES):
+            m = _OP_RE.match(line)
+            if not m:
+                continue
             op = m.group(1)
-            rest = [x.strip() for x in m.group(2).split("|")]
+            # int()/float() ignore the padding around each cell.
+            rest = m.group(2).split("|")
             if len(rest) < 6:
                 continue
             iterations = int(rest[0])
@@ -101,11 +98,8 @@ def parse_speed_kem_output(text):
                 "time_us_mean": time_us_mean,
                 "cycles_mean": cycles_mean,
             }
-        if "public key bytes:" in line:
-            m2 = re.search(
-                r"public key bytes:\s*(\d+),\s*ciphertext bytes:\s*(\d+),\s*secret key bytes:\s*(\d+),\s*shared secret key bytes:\s*(\d+),\s*NIST level:\s*([0-9]+)",
-                line,
-            )
+        elif "public key bytes:" in line:
+            m2 = _SIZES_RE.search(line)
             if m2:
                 sizes = {
                     "public_key_bytes": int(m2.group(1)),
@@ -117,82 +111,160 @@ def parse_speed_kem_output(text):
     return ops, sizes
 
 
-def run_benchmarks(exec_path, repeats, algorithms, output_csv_path):
-    stats = defaultdict(lambda: defaultdict(lambda: {
+def run_algorithm(exec_path, alg, repeats, verbose=True):
+    stats = defaultdict(lambda: {
         "time_us": [],
         "cycles": [],
         "iterations": [],
         "total_time_s": [],
-    }))
-    sizes_map = {}
-    for alg in algorithms:
-        print(f"\n=== Algorithm: {alg} ===")
-        for r in range(1, repeats + 1):
+    })
+    alg_sizes = {}
+    for r in range(1, repeats + 1):
+        if verbose:
             print(f"Run {r}/{repeats} ...", end="", flush=True)
-            try:
-                result = subprocess.run(
-                    [exec_path, "-i", "-d", "1", alg],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-            except subprocess.CalledProcessError as e:
+        # Parse stdout line by line as it arrives instead of buffering it whole.
+        # stderr is drained on a thread so a child that fills its pipe cannot
+        # block; both streams are kept for the error report.
+        with subprocess.Popen(
+            [exec_path, "-i", "-d", "1", alg],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        ) as proc:
+            err_chunks = []
+            err_reader = threading.Thread(target=lambda: err_chunks.append(proc.stderr.read()))
+            err_reader.start()
+            out_lines = []
+            ops, sizes = parse_speed_kem_output(tee_lines(proc.stdout, out_lines))
+            err_reader.join()
+            returncode = proc.wait()
+        if returncode != 0:
+            if verbose:
                 print(" ERROR")
-                sys.stderr.write(
-                    f"[ERROR] speed_kem failed for {alg} run {r} (exit code {e.returncode})\n"
-                )
-                sys.stderr.write(e.stdout + "\n" + e.stderr + "\n")
-                continue
-            ops, sizes = parse_speed_kem_output(result.stdout)
-            if sizes:
-                sizes_map[alg] = sizes
-            missing_ops = [op for op in OPERATIONS if op not in ops]
-            if missing_ops:
+            sys.stderr.write(
+                f"[ERROR] speed_kem failed for {alg} run {r} (exit code {returncode})\n"
+            )
+            sys.stderr.write("".join(out_lines) + "\n" + "".join(err_chunks) + "\n")
+            continue
+        if sizes:
+            alg_sizes = sizes
+        missing_ops = [op for op in OPERATIONS if op not in ops]
+        if missing_ops:
+            if verbose:
                 print(" ERROR (missing ops: " + ", ".join(missing_ops) + ")")
-                sys.stderr.write(
-                    f"[WARN] Missing operations for {alg} run {r}: {', '.join(missing_ops)}\n"
-                )
-                continue
-            for op in OPERATIONS:
-                rec = ops[op]
-                s = stats[alg][op]
-                s["iterations"].append(rec["iterations"])
-                s["total_time_s"].append(rec["total_time_s"])
-                s["time_us"].append(rec["time_us_mean"])
-                s["cycles"].append(rec["cycles_mean"])
+            sys.stderr.write(
+                f"[WARN] Missing operations for {alg} run {r}: {', '.join(missing_ops)}\n"
+            )
+            continue
+        for op in OPERATIONS:
+            rec = ops[op]
+            s = stats[op]
+            s["iterations"].append(rec["iterations"])
+            s["total_time_s"].append(rec["total_time_s"])
+            s["time_us"].append(rec["time_us_mean"])
+            s["cycles"].append(rec["cycles_mean"])
+        if verbose:
             print(" ok")
+    return stats, alg_sizes
+
+
+def usable_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def split_cpus(cpus, workers):
+    # Disjoint, equally sized slices; callers keep workers <= len(cpus).
+    size = len(cpus) // workers
+    return [set(cpus[i * size:(i + 1) * size]) for i in range(workers)]
+
+
+def run_benchmarks(exec_path, repeats, algorithms, output_csv_path, parallel=1):
+    stats = {}
+    sizes_map = {}
+    workers = 1
+    if parallel > 1 and len(algorithms) > 1:
+        # Size the pool from the CPUs this process may actually use (e.g. a
+        # single core when execute_benchmark.py pins it), so every worker
+        # gets CPUs of its own.
+        cpus = usable_cpus()
+        workers = min(parallel, len(algorithms), max(1, len(cpus) // 2))
+        if workers < min(parallel, len(algorithms)):
+            print(
+                f"[WARN] --parallel {parallel} clamped to {workers} worker(s): "
+                f"only {len(cpus)} usable CPU(s)"
+            )
+    if workers <= 1:
+        for alg in algorithms:
+            print(f"\n=== Algorithm: {alg} ===")
+            stats[alg], sizes = run_algorithm(exec_path, alg, repeats)
+            if sizes:
+                sizes_map[alg] = sizes
+    else:
+        # Runs of one algorithm stay serial; different algorithms run side by
+        # side, each worker pinned to its own CPU set. This cuts wall time at
+        # the cost of more measurement noise (shared caches, memory bandwidth,
+        # frequency scaling), so it is opt-in.
+        cpu_pool = queue.Queue()
+        for cpu_set in split_cpus(cpus, workers):
+            cpu_pool.put(cpu_set)
+
+        def pinned_run(alg):
+            cpu_set = cpu_pool.get()
+            try:
+                if hasattr(os, "sched_setaffinity"):
+                    # On Linux this pins the calling thread; the speed_kem
+                    # children it spawns inherit the mask.
+                    os.sched_setaffinity(0, cpu_set)
+                return run_algorithm(exec_path, alg, repeats, verbose=False)
+            finally:
+                cpu_pool.put(cpu_set)
+
+        print(f"[*] Running {len(algorithms)} algorithms with {workers} parallel workers")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(pinned_run, alg): alg for alg in algorithms}
+            for fut in as_completed(futures):
+                alg = futures[fut]
+                stats[alg], sizes = fut.result()
+                if sizes:
+                    sizes_map[alg] = sizes
+                n_ok = min((len(s["time_us"]) for s in stats[alg].values()), default=0)
+                print(f"=== Algorithm: {alg} done ({n_ok}/{repeats} runs ok) ===")
     summary_rows = []
     for alg in algorithms:
+        # Sizes are per algorithm, so look them up once for all its operations.
+        sizes = sizes_map.get(alg, {})
+        size_cells = {field: sizes.get(field) for field in SIZE_FIELDS}
         for op in OPERATIONS:
             if alg not in stats or op not in stats[alg]:
                 continue
             s = stats[alg][op]
-            time_vals = s["time_us"]
-            cycles_vals = s["cycles"]
-            it_vals = s["iterations"]
-            tt_vals = s["total_time_s"]
-            n_raw = len(time_vals)
+            time_vals = np.asarray(s["time_us"], dtype=np.float64)
+            n_raw = time_vals.size
             if n_raw == 0:
                 continue
-            keep_idx = iqr_filter_indices(time_vals)
-            if not keep_idx:
-                keep_idx = list(range(n_raw))
-            n = len(keep_idx)
-            time_f = [time_vals[i] for i in keep_idx]
-            cycles_f = [cycles_vals[i] for i in keep_idx]
-            it_f = [it_vals[i] for i in keep_idx]
-            tt_f = [tt_vals[i] for i in keep_idx]
-            mean_time = mean(time_f)
-            mean_cycles = mean(cycles_f)
-            mean_it = mean(it_f)
-            mean_tt = mean(tt_f)
+            keep = iqr_keep_mask(time_vals)
+            if not keep.any():
+                keep[:] = True
+            n = int(keep.sum())
+            # One (n, 4) block so every metric is reduced in a single pass;
+            # columns: time, cycles, iterations, total time.
+            samples = np.column_stack((
+                time_vals,
+                s["cycles"],
+                s["iterations"],
+                s["total_time_s"],
+            ))[keep]
+            mean_time, mean_cycles, mean_it, mean_tt = samples.mean(axis=0).tolist()
             if n > 1:
-                std_time = stdev(time_f)
-                std_cycles = stdev(cycles_f)
+                std_time, std_cycles = samples[:, :2].std(axis=0, ddof=1).tolist()
                 df = n - 1
                 tcrit = t_crit_95(df)
-                se_time = std_time / math.sqrt(n)
-                se_cycles = std_cycles / math.sqrt(n)
+                sqrt_n = math.sqrt(n)
+                se_time = std_time / sqrt_n
+                se_cycles = std_cycles / sqrt_n
                 ci_time_low = mean_time - tcrit * se_time
                 ci_time_high = mean_time + tcrit * se_time
                 ci_cycles_low = mean_cycles - tcrit * se_cycles
@@ -204,7 +276,6 @@ def run_benchmarks(exec_path, repeats, algorithms, output_csv_path):
                 ci_time_high = mean_time
                 ci_cycles_low = mean_cycles
                 ci_cycles_high = mean_cycles
-            sizes = sizes_map.get(alg, {})
             summary_rows.append({
                 "algorithm": alg,
                 "operation": op,
@@ -220,11 +291,7 @@ def run_benchmarks(exec_path, repeats, algorithms, output_csv_path):
                 "cycles_std": std_cycles,
                 "cycles_ci95_low": ci_cycles_low,
                 "cycles_ci95_high": ci_cycles_high,
-                "public_key_bytes": sizes.get("public_key_bytes"),
-                "ciphertext_bytes": sizes.get("ciphertext_bytes"),
-                "secret_key_bytes": sizes.get("secret_key_bytes"),
-                "shared_secret_bytes": sizes.get("shared_secret_bytes"),
-                "nist_level": sizes.get("nist_level"),
+                **size_cells,
             })
     fieldnames = [
         "algorithm",
@@ -241,17 +308,13 @@ def run_benchmarks(exec_path, repeats, algorithms, output_csv_path):
         "cycles_std",
         "cycles_ci95_low",
         "cycles_ci95_high",
-        "public_key_bytes",
-        "ciphertext_bytes",
-        "secret_key_bytes",
-        "shared_secret_bytes",
-        "nist_level",
+        *SIZE_FIELDS,
     ]
-    with open(output_csv_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in summary_rows:
-            writer.writerow(row)
+    summary = pd.DataFrame(summary_rows, columns=fieldnames)
+    # Nullable ints so missing sizes stay empty cells instead of turning the
+    # whole column into floats.
+    summary[SIZE_FIELDS] = summary[SIZE_FIELDS].astype("Int64")
+    summary.to_csv(output_csv_path, index=False)
     print(f"\nSummary data written to: {output_csv_path}")
 
 
@@ -278,7 +341,18 @@ def main():
         default=None,
         help="Run only this algorithm (default: run all predefined algorithms)",
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Benchmark up to N algorithms at once, each pinned to its own CPUs "
+        "(runs of one algorithm stay serial; faster but noisier; default: 1)",
+    )
     args = parser.parse_args()
+    if args.parallel < 1:
+        sys.stderr.write("[ERROR] --parallel must be >= 1\n")
+        sys.exit(1)
     script_dir = os.path.dirname(os.path.abspath(__file__))
     if args.exec_path is None:
         exec_path = os.path.join(script_dir, "speed_kem")
@@ -295,7 +369,7 @@ def main():
         algorithms = [args.alg]
     else:
         algorithms = ALGORITHMS
-    run_benchmarks(exec_path, args.repeats, algorithms, output_csv_path)
+    run_benchmarks(exec_path, args.repeats, algorithms, output_csv_path, args.parallel)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
-import glob
+import contextlib
+import csv
+import functools
 import math
 import os
+from typing import Dict, List, Tuple
 
-import pandas as pd
 
-
-def latex_escape(text: str) -> str:
-    replacements = {
+_LATEX_ESCAPES = str.maketrans(
+    {
         "_": r"\_",
         "&": r"\&",
         "%": r"\%",
@@ -18,7 +19,12 @@ def latex_escape(text: str) -> str:
         "~": r"\textasciitilde{}",
         "^": r"\textasciicircum{}",
     }
-    return "".join(replacements.get(ch, ch) for ch in text)
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def latex_escape(text: str) -> str:
+    return text.translate(_LATEX_ESCAPES)
 
 
 def format_time_us(value: float) -> str:
@@ -41,12 +47,24 @@ def format_cycles_k(value: float) -> str:
     return f"{grouped}k"
 
 
+def to_float(cell: str) -> float:
+    return float(cell) if cell else math.nan
+
+
 def find_latest_csv(results_dir: str, prefix: str) -> str:
-    pattern = os.path.join(results_dir, f"{prefix}_*.csv")
-    candidates = sorted(glob.glob(pattern))
-    if not candidates:
+    # Single scandir pass; the timestamped names order chronologically, so the
+    # newest run is the lexicographic max and no full sort is needed.
+    latest = None
+    with contextlib.suppress(FileNotFoundError), os.scandir(results_dir) as it:
+        latest = max(
+            (e for e in it if e.name.startswith(f"{prefix}_") and e.name.endswith(".csv")),
+            key=lambda e: e.name,
+            default=None,
+        )
+    if latest is None:
+        pattern = os.path.join(results_dir, f"{prefix}_*.csv")
         raise SystemExit(f"[ERROR] No CSV files found matching {pattern}")
-    return candidates[-1]
+    return latest.path
 
 
 def format_algorithm_name(alg: str) -> str:
@@ -54,8 +72,11 @@ def format_algorithm_name(alg: str) -> str:
     return latex_escape(alg)
 
 
-def build_sig_table(df: pd.DataFrame) -> str:
-    algorithms = list(dict.fromkeys(df["algorithm"]))
+def build_sig_table(rows: List[Dict[str, str]]) -> str:
+    algorithms = list(dict.fromkeys(r["algorithm"] for r in rows))
+    index: Dict[Tuple[str, str], Dict[str, str]] = {}
+    for r in rows:
+        index.setdefault((r["algorithm"], r["operation"]), r)
     operations = ["keypair", "sign", "verify"]
 
     lines: list[str] = []
@@ -79,14 +100,13 @@ def build_sig_table(df: pd.DataFrame) -> str:
     for alg in algorithms:
         row_cells = [format_algorithm_name(alg)]
         for op in operations:
-            sub = df[(df["algorithm"] == alg) & (df["operation"] == op)]
-            if sub.empty:
+            row = index.get((alg, op))
+            if row is None:
                 row_cells.extend(["--", "--"])
             else:
-                row = sub.iloc[0]
-                t_mean = format_time_us(row["time_us_mean"])
-                t_std = format_time_us(row["time_us_std"])
-                cycles = format_cycles_k(row["cycles_mean"])
+                t_mean = format_time_us(to_float(row["time_us_mean"]))
+                t_std = format_time_us(to_float(row["time_us_std"]))
+                cycles = format_cycles_k(to_float(row["cycles_mean"]))
                 row_cells.extend([f"{t_mean} ± {t_std}", cycles])
         lines.append("      " + " & ".join(row_cells) + r" \\")
 
@@ -105,8 +125,9 @@ def main() -> None:
     results_dir = os.path.join(script_dir, "results_speed_sig")
     csv_path = find_latest_csv(results_dir, "results_speed_sig")
     print(f"[*] Using SIG CSV: {csv_path}")
-    df = pd.read_csv(csv_path)
-    latex_table = build_sig_table(df)
+    with open(csv_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    latex_table = build_sig_table(rows)
     out_path = os.path.join(results_dir, "speed_sig_table.txt")
     with open(out_path, "w", encoding="utf-8") as f:
         f.write(latex_table + "\n")
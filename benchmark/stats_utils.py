@@ -0,0 +1,41 @@
+from typing import Union
+
+import numpy as np
+
+# Two-tailed 95% t critical values (alpha=0.05) indexed by degrees of freedom
+# (df 1..200). Index 0 is unused (0.0) and the last entry is the
+# normal-approximation limit used for df > 200.
+T_CRIT_95 = np.array(
+    [
+        0.000, 12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262,
+        2.228, 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093,
+        2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045,
+        2.042, 2.040, 2.037, 2.035, 2.032, 2.030, 2.028, 2.026, 2.024, 2.023,
+        2.021, 2.020, 2.018, 2.017, 2.015, 2.014, 2.013, 2.012, 2.011, 2.010,
+        2.009, 2.008, 2.007, 2.006, 2.005, 2.004, 2.003, 2.002, 2.002, 2.001,
+        2.000, 2.000, 1.999, 1.998, 1.998, 1.997, 1.997, 1.996, 1.995, 1.995,
+        1.994, 1.994, 1.993, 1.993, 1.993, 1.992, 1.992, 1.991, 1.991, 1.990,
+        1.990, 1.990, 1.989, 1.989, 1.989, 1.988, 1.988, 1.988, 1.987, 1.987,
+        1.987, 1.986, 1.986, 1.986, 1.986, 1.985, 1.985, 1.985, 1.984, 1.984,
+        1.984, 1.984, 1.983, 1.983, 1.983, 1.983, 1.983, 1.982, 1.982, 1.982,
+        1.982, 1.982, 1.981, 1.981, 1.981, 1.981, 1.981, 1.980, 1.980, 1.980,
+        1.980, 1.980, 1.980, 1.979, 1.979, 1.979, 1.979, 1.979, 1.979, 1.979,
+        1.978, 1.978, 1.978, 1.978, 1.978, 1.978, 1.978, 1.977, 1.977, 1.977,
+        1.977, 1.977, 1.977, 1.977, 1.977, 1.976, 1.976, 1.976, 1.976, 1.976,
+        1.976, 1.976, 1.976, 1.976, 1.975, 1.975, 1.975, 1.975, 1.975, 1.975,
+        1.975, 1.975, 1.975, 1.975, 1.975, 1.974, 1.974, 1.974, 1.974, 1.974,
+        1.974, 1.974, 1.974, 1.974, 1.974, 1.974, 1.974, 1.973, 1.973, 1.973,
+        1.973, 1.973, 1.973, 1.973, 1.973, 1.973, 1.973, 1.973, 1.973, 1.973,
+        1.973, 1.972, 1.972, 1.972, 1.972, 1.972, 1.972, 1.972, 1.972, 1.972,
+        1.972, 1.960,
+    ],
+    dtype=np.float64,
+)
+
+
+def t_crit_95(df: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+    """Two-tailed 95% t critical value; accepts a scalar or an array of df."""
+    idx = np.clip(df, 0, T_CRIT_95.size - 1)
+    if np.ndim(idx) == 0:
+        return float(T_CRIT_95[idx])
+    return T_CRIT_95[idx]
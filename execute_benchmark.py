@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 import argparse
 import glob
+import importlib
+import importlib.util
 import os
+import re
+import runpy
+import shutil
 import subprocess
 import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 def run_cmd(cmd, cwd=None, env=None):
@@ -15,10 +22,94 @@ def run_cmd(cmd, cwd=None, env=None):
         )
 
 
+def prewarm_imports():
+    # Imported once here so every forked script below starts with them loaded.
+    for mod in ("numpy", "pandas", "matplotlib.pyplot"):
+        try:
+            importlib.import_module(mod)
+        except ImportError:
+            pass
+
+
+def run_script(script_path, args, cwd, core=None, fifo=False):
+    # Runs the script as __main__ in a fork of this interpreter, so modules
+    # loaded by prewarm_imports() are not imported again. When core is set the
+    # child pins itself to it explicitly instead of relying on inheritance.
+    # fifo runs only that child as SCHED_FIFO (root only), so ordinary tasks
+    # cannot preempt the timing runs; the driver stays at SCHED_OTHER.
+    fifo = fifo and hasattr(os, "sched_setscheduler") and os.geteuid() == 0
+    if not hasattr(os, "fork"):
+        prefix = []
+        if fifo and shutil.which("chrt"):
+            prefix += ["chrt", "-f", "50"]
+        if core is not None and shutil.which("taskset"):
+            prefix += ["taskset", "-c", str(core)]
+        run_cmd(prefix + [sys.executable, script_path] + args, cwd=cwd)
+        return
+
+    cmd_str = " ".join([script_path] + args)
+    print(f"[*] Running: {cmd_str} (cwd={cwd}, forked)")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            if core is not None:
+                os.sched_setaffinity(0, {core})
+            if fifo:
+                try:
+                    os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(50))
+                except OSError as e:
+                    print(f"[WARN] Could not set SCHED_FIFO: {e}")
+            os.chdir(cwd)
+            sys.argv = [script_path] + args
+            sys.path.insert(0, os.path.dirname(script_path))
+            runpy.run_path(script_path, run_name="__main__")
+            code = 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    _, status = os.waitpid(pid, 0)
+    if os.WIFEXITED(status):
+        returncode = os.WEXITSTATUS(status)
+    else:
+        returncode = -os.WTERMSIG(status)
+    if returncode != 0:
+        raise SystemExit(
+            f"[ERROR] Command failed with code {returncode}: {cmd_str}"
+        )
+
+
+def run_module_main(module_dir, name):
+    # For the table/chart steps, which only read CSVs and write files: import
+    # the module once and call its main() in this process.
+    print(f"[*] Running: {name}.main() (in-process)")
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    importlib.import_module(name).main()
+
+
 def ensure_venv(root_dir: str):
     if os.environ.get("LIBOQS_BENCH_VENV_ACTIVE") == "1":
         return
 
+    # The child scripts run under sys.executable, so if this interpreter can
+    # already import the plotting/analysis stack there is no need for a venv.
+    if all(importlib.util.find_spec(m) is not None for m in ("matplotlib", "pandas")):
+        print("[*] matplotlib and pandas already available; not using a venv.")
+        os.environ["LIBOQS_BENCH_VENV_ACTIVE"] = "1"
+        return
+
     venv_dir = os.path.join(root_dir, ".venv")
     venv_python = os.path.join(venv_dir, "bin", "python")
 
@@ -31,34 +122,122 @@ def ensure_venv(root_dir: str):
             cwd=root_dir,
         )
 
-    env = os.environ.copy()
-    env["LIBOQS_BENCH_VENV_ACTIVE"] = "1"
+    # Mark the process environment itself; execve hands it to the venv
+    # interpreter and every child inherits it from there, so no copy is made.
+    os.environ["LIBOQS_BENCH_VENV_ACTIVE"] = "1"
     script_path = os.path.abspath(__file__)
     args = [venv_python, script_path] + sys.argv[1:]
     print(f"[*] Re-executing inside venv: {' '.join(args)}")
-    os.execve(venv_python, args, env)
+    os.execve(venv_python, args, os.environ)
 
 
-def choose_isolated_core():
+# CPUs this process may run on, snapshotted once at startup (before the
+# benchmark phase pins affinity to a single core).
+try:
+    _AFFINITY = tuple(sorted(os.sched_getaffinity(0)))
+except AttributeError:
+    _AFFINITY = ()
+
+
+def parse_cpu_list(text: str) -> set:
+    # sysfs CPU lists look like "0,32" or "0-3,8-11".
+    cpus = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.update(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def cpu_siblings(cpu: int) -> set:
+    # SMT siblings of cpu, itself included; empty when the topology is unknown.
+    path = f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list"
     try:
-        aff = os.sched_getaffinity(0)
-    except AttributeError:
-        return None, None
+        return parse_cpu_list(read_sysfs(path))
+    except (OSError, ValueError):
+        return set()
 
-    if not aff:
+
+def choose_isolated_core():
+    if not _AFFINITY:
         return None, None
 
-    sorted_cores = sorted(aff)
-    chosen = None
-    for c in sorted_cores:
-        if c not in (0, 1):
-            chosen = c
-            break
+    # Avoid CPUs 0/1 and, on SMT machines, every hardware thread sharing a
+    # physical core with them (e.g. cpu0's sibling may be cpu32).
+    busy = {0, 1} | cpu_siblings(0) | cpu_siblings(1)
+    chosen = next(
+        (c for c in _AFFINITY if c not in busy),
+        next((c for c in _AFFINITY if c not in (0, 1)), _AFFINITY[0]),
+    )
+    return chosen, set(_AFFINITY)
+
+
+def read_sysfs(path: str) -> str:
+    # Unbuffered fd I/O: sysfs attributes are tiny, so one read() is enough
+    # and the io.TextIOWrapper setup of open() is pure overhead.
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096).decode().strip()
+    finally:
+        os.close(fd)
+
+
+def write_sysfs(path: str, value: str):
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        os.write(fd, value.encode())
+    finally:
+        os.close(fd)
+
+
+def exchange_sysfs(path: str, new_value: str) -> str:
+    # One O_RDWR open per knob: read the current value and write new_value
+    # only if it differs. Returns the previous value for the restore step.
+    fd = os.open(path, os.O_RDWR)
+    try:
+        current = os.pread(fd, 4096, 0).decode().strip()
+        if current != new_value:
+            os.pwrite(fd, new_value.encode(), 0)
+        return current
+    finally:
+        os.close(fd)
 
-    if chosen is None:
-        chosen = sorted_cores[0]
 
-    return chosen, aff
+def pin_core_frequency(cpu: int):
+    # Clamp scaling_min_freq == scaling_max_freq to the highest non-boost
+    # frequency so every run sees the same clock. This works with both
+    # acpi-cpufreq and intel_pstate, unlike the userspace governor.
+    cpufreq_dir = f"/sys/devices/system/cpu/cpu{cpu}/cpufreq"
+    min_path = os.path.join(cpufreq_dir, "scaling_min_freq")
+    max_path = os.path.join(cpufreq_dir, "scaling_max_freq")
+    try:
+        orig_min = read_sysfs(min_path)
+        orig_max = read_sysfs(max_path)
+    except OSError:
+        return None
+
+    try:
+        target = read_sysfs(os.path.join(cpufreq_dir, "base_frequency"))
+    except OSError:
+        # Turbo is already off here, so scaling_max_freq is the non-boost top.
+        target = orig_max
+
+    try:
+        write_sysfs(max_path, target)
+        write_sysfs(min_path, target)
+    except OSError as e:
+        print(f"[WARN] Could not pin cpu{cpu} frequency: {e}")
+        for path, value in ((max_path, orig_max), (min_path, orig_min)):
+            try:
+                write_sysfs(path, value)
+            except OSError:
+                pass
+        return None
+
+    print(f"[*] cpu{cpu} frequency pinned to {int(target) // 1000} MHz")
+    return {"cpu": cpu, "min": orig_min, "max": orig_max}
 
 
 def setup_benchmark_cpu_mode():
@@ -66,6 +245,9 @@ def setup_benchmark_cpu_mode():
         "affinity_original": None,
         "turbo": None,
         "governors": {},
+        "offlined_cpus": [],
+        "freq": None,
+        "core": None,
     }
 
     chosen_core, orig_aff = choose_isolated_core()
@@ -73,6 +255,7 @@ def setup_benchmark_cpu_mode():
         try:
             os.sched_setaffinity(0, {chosen_core})
             state["affinity_original"] = orig_aff
+            state["core"] = chosen_core
             print(f"[*] CPU affinity pinned to core {chosen_core}")
         except Exception as e:
             print(f"[WARN] Could not set CPU affinity: {e}")
@@ -81,60 +264,71 @@ def setup_benchmark_cpu_mode():
         print("[WARN] Script is not running as root; will not change Turbo Boost/governor, only CPU affinity.")
         return state
 
-    turbo_candidates = [
-        "/sys/devices/system/cpu/intel_pstate/no_turbo",
-        "/sys/devices/system/cpu/cpufreq/boost",
-    ]
-    for path in turbo_candidates:
-        if os.path.exists(path):
+    if state["affinity_original"] is not None:
+        # Take the SMT siblings of the pinned core offline so no other task
+        # shares its execution units while measuring.
+        for sibling in sorted(cpu_siblings(chosen_core) - {chosen_core}):
+            online_path = f"/sys/devices/system/cpu/cpu{sibling}/online"
             try:
-                with open(path, "r") as f:
-                    orig = f.read().strip()
-                state["turbo"] = {"path": path, "original": orig}
-                if path.endswith("no_turbo"):
-                    new_val = "1"
-                elif path.endswith("boost"):
-                    new_val = "0"
-                else:
-                    new_val = None
-
-                if new_val is not None and orig != new_val:
-                    try:
-                        with open(path, "w") as fw:
-                            fw.write(new_val)
-                        print(f"[*] Turbo Boost disabled at {path} (value={new_val})")
-                    except PermissionError:
-                        print(f"[WARN] No permission to write to {path}")
-                break
-            except PermissionError:
-                print(f"[WARN] No permission to read {path}")
+                if read_sysfs(online_path) == "1":
+                    write_sysfs(online_path, "0")
+                    state["offlined_cpus"].append(sibling)
+            except FileNotFoundError:
                 continue
+            except OSError as e:
+                print(f"[WARN] Could not take SMT sibling cpu{sibling} offline: {e}")
+        if state["offlined_cpus"]:
+            cpus = ", ".join(f"cpu{c}" for c in state["offlined_cpus"])
+            print(f"[*] SMT sibling(s) of core {chosen_core} taken offline: {cpus}")
+
+    # (path, value that disables boost) for intel_pstate and acpi-cpufreq.
+    turbo_candidates = [
+        ("/sys/devices/system/cpu/intel_pstate/no_turbo", "1"),
+        ("/sys/devices/system/cpu/cpufreq/boost", "0"),
+    ]
+    for path, new_val in turbo_candidates:
+        try:
+            orig = exchange_sysfs(path, new_val)
+        except FileNotFoundError:
+            continue
+        except PermissionError:
+            print(f"[WARN] No permission to write to {path}")
+            continue
+        state["turbo"] = {"path": path, "original": orig}
+        if orig != new_val:
+            print(f"[*] Turbo Boost disabled at {path} (value={new_val})")
+        break
 
     cpu_glob = "/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_governor"
     for gov_path in glob.glob(cpu_glob):
         try:
-            with open(gov_path, "r") as f:
-                orig_gov = f.read().strip()
-            state["governors"][gov_path] = orig_gov
-            if orig_gov != "performance":
-                try:
-                    with open(gov_path, "w") as fw:
-                        fw.write("performance")
-                except PermissionError:
-                    print(f"[WARN] No permission to write to {gov_path}")
+            state["governors"][gov_path] = exchange_sysfs(gov_path, "performance")
         except FileNotFoundError:
             continue
         except PermissionError:
-            print(f"[WARN] No permission to read {gov_path}")
+            print(f"[WARN] No permission to write to {gov_path}")
             continue
 
     if state["governors"]:
         print("[*] CPU governors set to 'performance' where possible.")
 
+    if state["affinity_original"] is not None:
+        state["freq"] = pin_core_frequency(chosen_core)
+
     return state
 
 
+def export_benchmark_env(state):
+    # Children (forked or exec'd) inherit os.environ, so they can read the
+    # chosen core from here instead of inspecting their affinity again.
+    if state["core"] is not None:
+        os.environ["LIBOQS_BENCH_CORE"] = str(state["core"])
+
+
 def restore_benchmark_cpu_mode(state):
+    # Anything launched after the restore must not see the released core.
+    os.environ.pop("LIBOQS_BENCH_CORE", None)
+
     if state and state.get("affinity_original") is not None:
         try:
             os.sched_setaffinity(0, state["affinity_original"])
@@ -146,43 +340,151 @@ def restore_benchmark_cpu_mode(state):
         print("[WARN] Not running as root; nothing to restore for Turbo/governor.")
         return
 
+    # Bring offlined CPUs back first so their governors can be restored too.
+    for cpu in state.get("offlined_cpus", []) if state else []:
+        try:
+            write_sysfs(f"/sys/devices/system/cpu/cpu{cpu}/online", "1")
+            print(f"[*] cpu{cpu} brought back online.")
+        except OSError as e:
+            print(f"[WARN] Could not bring cpu{cpu} back online: {e}")
+
+    freq_info = state.get("freq") if state else None
+    if freq_info:
+        cpufreq_dir = f"/sys/devices/system/cpu/cpu{freq_info['cpu']}/cpufreq"
+        try:
+            # Widen the range again: raise max first, then lower min.
+            write_sysfs(os.path.join(cpufreq_dir, "scaling_max_freq"), freq_info["max"])
+            write_sysfs(os.path.join(cpufreq_dir, "scaling_min_freq"), freq_info["min"])
+            print(f"[*] cpu{freq_info['cpu']} frequency range restored.")
+        except OSError as e:
+            print(f"[WARN] Could not restore cpu{freq_info['cpu']} frequency range: {e}")
+
     turbo_info = state.get("turbo") if state else None
-    if turbo_info and os.path.exists(turbo_info["path"]):
+    if turbo_info:
         try:
-            with open(turbo_info["path"], "w") as f:
-                f.write(turbo_info["original"])
+            write_sysfs(turbo_info["path"], turbo_info["original"])
             print(
                 f"[*] Turbo Boost restored "
                 f"({turbo_info['path']}={turbo_info['original']})."
             )
+        except FileNotFoundError:
+            pass
         except PermissionError:
             print(f"[WARN] No permission to restore turbo at {turbo_info['path']}")
 
+    # The governor paths were enumerated once by setup_benchmark_cpu_mode;
+    # reuse that snapshot instead of walking sysfs again. A CPU that went
+    # offline meanwhile simply fails the open.
     govs = state.get("governors", {}) if state else {}
     for gov_path, orig_gov in govs.items():
-        if not os.path.exists(gov_path):
-            continue
         try:
-            with open(gov_path, "w") as f:
-                f.write(orig_gov)
+            write_sysfs(gov_path, orig_gov)
+        except FileNotFoundError:
+            continue
         except PermissionError:
             print(f"[WARN] No permission to restore governor at {gov_path}")
 
 
 def needs_build(liboqs_dir: str) -> bool:
-    build_dir = os.path.join(liboqs_dir, "build")
-    tests_dir = os.path.join(build_dir, "tests")
+    tests_dir = os.path.join(liboqs_dir, "build", "tests")
 
-    if not os.path.isdir(build_dir):
+    # One directory listing instead of an isdir + four isfile probes; a
+    # missing build/ or build/tests/ both mean a (re)build is needed.
+    try:
+        with os.scandir(tests_dir) as it:
+            files = {e.name for e in it if e.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
         return True
 
-    expected_bins = ["speed_kem", "speed_sig", "test_kem_mem", "test_sig_mem"]
-    for bin_name in expected_bins:
-        bin_path = os.path.join(tests_dir, bin_name)
-        if not os.path.isfile(bin_path):
-            return True
+    expected_bins = {"speed_kem", "speed_sig", "test_kem_mem", "test_sig_mem"}
+    return not expected_bins <= files
 
-    return False
+
+LIBOQS_URL = "https://github.com/open-quantum-safe/liboqs.git"
+LIBOQS_TAG = "0.15.0"
+# Top-level directories the CMake build reads; in cone mode the files at the
+# repository root (CMakeLists.txt, VERSION, ...) are always checked out too.
+LIBOQS_SPARSE_DIRS = [".CMake", "src", "tests", "docs"]
+
+
+def git_version():
+    try:
+        out = subprocess.run(
+            ["git", "--version"], capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return ()
+    m = re.search(r"(\d+)\.(\d+)", out)
+    return (int(m.group(1)), int(m.group(2))) if m else ()
+
+
+def clone_liboqs(root_dir: str, liboqs_dir: str):
+    # Partial + sparse clone: only blobs under LIBOQS_SPARSE_DIRS are fetched.
+    # Needs git >= 2.25 (sparse-checkout) and a server with filter support.
+    # Cone mode is only the default for "set" from git 2.37 on, so it is
+    # enabled explicitly; without it the root CMakeLists.txt would be left
+    # out. If any step fails, fall back to the plain shallow clone.
+    if git_version() >= (2, 25):
+        steps = [
+            (
+                [
+                    "git", "clone", "--filter=blob:none", "--sparse",
+                    "--branch", LIBOQS_TAG, "--depth", "1", LIBOQS_URL, "liboqs",
+                ],
+                root_dir,
+            ),
+            (["git", "sparse-checkout", "init", "--cone"], liboqs_dir),
+            (["git", "sparse-checkout", "set", *LIBOQS_SPARSE_DIRS], liboqs_dir),
+        ]
+        for cmd, cwd in steps:
+            print(f"[*] Running: {' '.join(cmd)} (cwd={cwd})")
+            if subprocess.run(cmd, cwd=cwd).returncode != 0:
+                break
+        else:
+            return
+        print("[WARN] Sparse clone failed; retrying with a full shallow clone.")
+        shutil.rmtree(liboqs_dir, ignore_errors=True)
+
+    run_cmd(
+        ["git", "clone", "--branch", LIBOQS_TAG, "--depth", "1", LIBOQS_URL, "liboqs"],
+        cwd=root_dir,
+    )
+
+
+def _chown_entries(dir_fd: int, dir_path: str, uid: int, gid: int):
+    # Entries are chowned relative to the open directory fd, so no absolute
+    # path is re-resolved per entry; symlinks themselves are chowned, never
+    # their targets. dir_path is only used for warnings. Returns the names of
+    # the subdirectories still to be walked.
+    try:
+        with os.scandir(dir_fd) as it:
+            entries = list(it)
+    except OSError as e:
+        print(f"[WARN] Could not list {dir_path}: {e}")
+        return []
+    subdirs = []
+    for entry in entries:
+        try:
+            os.chown(entry.name, uid, gid, dir_fd=dir_fd, follow_symlinks=False)
+        except PermissionError:
+            print(f"[WARN] No permission to chown {os.path.join(dir_path, entry.name)}")
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.name)
+    return subdirs
+
+
+def _chown_subtree(parent_fd: int, parent_path: str, name: str, uid: int, gid: int):
+    dir_path = os.path.join(parent_path, name)
+    try:
+        dir_fd = os.open(name, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=parent_fd)
+    except OSError as e:
+        print(f"[WARN] Could not open {dir_path}: {e}")
+        return
+    try:
+        for sub in _chown_entries(dir_fd, dir_path, uid, gid):
+            _chown_subtree(dir_fd, dir_path, sub, uid, gid)
+    finally:
+        os.close(dir_fd)
 
 
 def fix_permissions_for_sudo_user(path: str):
@@ -202,19 +504,22 @@ def fix_permissions_for_sudo_user(path: str):
     print(f"[*] Recursively chown-ing {path} to UID={uid}, GID={gid}...")
     try:
         os.chown(path, uid, gid)
-        for root, dirs, files in os.walk(path):
-            for d in dirs:
-                full = os.path.join(root, d)
-                try:
-                    os.chown(full, uid, gid)
-                except PermissionError:
-                    print(f"[WARN] No permission to chown {full}")
-            for f in files:
-                full = os.path.join(root, f)
-                try:
-                    os.chown(full, uid, gid)
-                except PermissionError:
-                    print(f"[WARN] No permission to chown {full}")
+        root_fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            # Top-level files are handled here; each top-level directory
+            # (liboqs/, .venv/, benchmark/, ...) is walked on its own thread,
+            # since chown releases the GIL while in the kernel.
+            subdirs = _chown_entries(root_fd, path, uid, gid)
+            workers = max(1, min(len(subdirs), os.cpu_count() or 1))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_chown_subtree, root_fd, path, name, uid, gid)
+                    for name in subdirs
+                ]
+                for fut in as_completed(futures):
+                    fut.result()
+        finally:
+            os.close(root_fd)
         print("[*] Permissions successfully adjusted.")
     except PermissionError as e:
         print(f"[WARN] Failed to adjust permissions for {path}: {e}")
@@ -244,20 +549,8 @@ def main():
     liboqs_dir = os.path.join(root_dir, "liboqs")
 
     if not os.path.exists(liboqs_dir):
-        print("[*] Cloning liboqs (tag 0.15.0)...")
-        run_cmd(
-            [
-                "git",
-                "clone",
-                "--branch",
-                "0.15.0",
-                "--depth",
-                "1",
-                "https://github.com/open-quantum-safe/liboqs.git",
-                "liboqs",
-            ],
-            cwd=root_dir,
-        )
+        print(f"[*] Cloning liboqs (tag {LIBOQS_TAG})...")
+        clone_liboqs(root_dir, liboqs_dir)
     else:
         print("[*] liboqs directory already exists; skipping clone.")
 
@@ -269,11 +562,15 @@ def main():
             ["cmake", "-GNinja", "-DOQS_ENABLE_KEM_HQC=ON", ".."],
             cwd=build_dir,
         )
-        run_cmd(["ninja"], cwd=build_dir)
+        # Explicit job count from the usable CPUs (not the whole host), with
+        # a matching load cap so a busy machine is not oversubscribed.
+        njobs = str(len(_AFFINITY) or os.cpu_count() or 1)
+        run_cmd(["ninja", "-j", njobs, "-l", njobs], cwd=build_dir)
     else:
         print("[*] Existing build with expected binaries; skipping cmake/ninja.")
 
     cpu_state = setup_benchmark_cpu_mode()
+    export_benchmark_env(cpu_state)
 
     try:
         tests_dir = os.path.join(build_dir, "tests")
@@ -282,63 +579,37 @@ def main():
 
         bench_dir = os.path.join(root_dir, "benchmark")
 
-        run_cmd(
-            [
-                sys.executable,
-                os.path.join(bench_dir, "run_speed_kem_benchmark.py"),
-                "-n",
-                str(args.num_runs),
-                "--exec",
-                speed_kem_exec,
-            ],
-            cwd=bench_dir,
-        )
-        run_cmd(
-            [
-                sys.executable,
-                os.path.join(bench_dir, "run_speed_sig_benchmark.py"),
-                "-n",
-                str(args.num_runs),
-                "--exec",
-                speed_sig_exec,
-            ],
-            cwd=bench_dir,
-        )
+        prewarm_imports()
+        core = cpu_state["core"]
 
-        run_cmd(
-            [
-                sys.executable,
-                os.path.join(bench_dir, "speed_kem_table_tex.py"),
-            ],
+        run_script(
+            os.path.join(bench_dir, "run_speed_kem_benchmark.py"),
+            ["-n", str(args.num_runs), "--exec", speed_kem_exec],
             cwd=bench_dir,
+            core=core,
+            fifo=True,
         )
-        run_cmd(
-            [
-                sys.executable,
-                os.path.join(bench_dir, "speed_sig_table_tex.py"),
-            ],
+        run_script(
+            os.path.join(bench_dir, "run_speed_sig_benchmark.py"),
+            ["-n", str(args.num_runs), "--exec", speed_sig_exec],
             cwd=bench_dir,
+            core=core,
+            fifo=True,
         )
 
-        run_cmd(
-            [
-                sys.executable,
-                os.path.join(bench_dir, "run_all_mem_bench.py"),
-                "-n",
-                str(args.num_runs),
-            ],
-            cwd=bench_dir,
-        )
+        run_module_main(bench_dir, "speed_kem_table_tex")
+        run_module_main(bench_dir, "speed_sig_table_tex")
 
-        run_cmd(
-            [sys.executable, os.path.join(bench_dir, "mem_kem_chart.py")],
-            cwd=bench_dir,
-        )
-        run_cmd(
-            [sys.executable, os.path.join(bench_dir, "mem_sig_chart.py")],
+        run_script(
+            os.path.join(bench_dir, "run_all_mem_bench.py"),
+            ["-n", str(args.num_runs)],
             cwd=bench_dir,
+            core=core,
         )
 
+        run_module_main(bench_dir, "mem_kem_chart")
+        run_module_main(bench_dir, "mem_sig_chart")
+
         print("\n[OK] Full pipeline (speed + memory + charts + LaTeX tables) completed.")
     finally:
         restore_benchmark_cpu_mode(cpu_state)